@@ -11,6 +11,17 @@ import sys
 import os
 from threading import Lock
 
+# Iterations of pure-Python work between wall-clock checks
+CHUNK_SIZE = 1_000_000
+
+# Number of (long) simulated I/O waits per thread
+IO_STEPS = 3
+
+
+def _do_chunk(n):
+    """Run n iterations of pure-Python work (holds the GIL throughout)."""
+    return sum(1 for _ in range(n))
+
 
 class GILMonitor:
     """Monitor GIL behavior and thread execution."""
@@ -18,26 +29,25 @@ class GILMonitor:
     def __init__(self):
         self.lock = Lock()
         self.thread_stats = {}
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
     
     def log_thread_activity(self, thread_id, message):
         """Log thread activity with timestamp."""
         with self.lock:
-            current_time = time.time() - self.start_time
+            current_time = time.monotonic() - self.start_time
             print(f"[{current_time:.3f}s] Thread-{thread_id}: {message}")
     
     def cpu_intensive_work(self, thread_id, duration=2):
         """CPU-intensive work that will be limited by GIL."""
         self.log_thread_activity(thread_id, "Starting CPU-intensive work")
         
-        start_time = time.time()
+        deadline_ns = time.monotonic_ns() + int(duration * 1e9)
         counter = 0
         
-        while time.time() - start_time < duration:
-            # CPU-intensive operation
-            counter += 1
-            if counter % 1000000 == 0:  # Log every million iterations
-                self.log_thread_activity(thread_id, f"Processed {counter} iterations")
+        while time.monotonic_ns() < deadline_ns:
+            # CPU-intensive chunk; the clock is only checked between chunks
+            counter += _do_chunk(CHUNK_SIZE)
+            self.log_thread_activity(thread_id, f"Processed {counter} iterations")
         
         self.log_thread_activity(thread_id, f"Completed CPU work: {counter} iterations")
         return counter
@@ -46,15 +56,15 @@ class GILMonitor:
         """I/O-intensive work where GIL is released."""
         self.log_thread_activity(thread_id, "Starting I/O-intensive work")
         
-        start_time = time.time()
         counter = 0
         
-        while time.time() - start_time < duration:
+        # A few long waits model the same I/O time as many short ones
+        # with far fewer wake-ups and GIL re-acquisitions
+        for _ in range(IO_STEPS):
             # I/O operation (sleep releases GIL)
-            time.sleep(0.1)
+            time.sleep(duration / IO_STEPS)
             counter += 1
-            if counter % 5 == 0:  # Log every 5 I/O operations
-                self.log_thread_activity(thread_id, f"Completed {counter} I/O operations")
+            self.log_thread_activity(thread_id, f"Completed {counter} I/O operations")
         
         self.log_thread_activity(thread_id, f"Completed I/O work: {counter} operations")
         return counter
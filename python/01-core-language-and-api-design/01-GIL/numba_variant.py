@@ -0,0 +1,36 @@
+"""
+Numba-compiled versions of the CPU-bound kernels.
+
+Numba compiles these functions to machine code. With ``nogil=True`` the
+compiled code releases the GIL while it runs, so several threads can execute
+the same CPU-bound kernel in parallel - something pure Python threads cannot do.
+"""
+
+from numba import njit
+
+# Keeps the factorial inside int64 (Numba has no arbitrary-precision ints)
+MODULUS = 1_000_000_007
+
+
+@njit(nogil=True, cache=True)
+def cpu_intensive_task(n):
+    """Calculate n! modulo a large prime (compiled, GIL released)."""
+    result = 1
+    for i in range(1, n + 1):
+        result = (result * i) % MODULUS
+    return result
+
+
+@njit(nogil=True, cache=True)
+def cpu_bound_sync(n):
+    """Sum of squares below n (compiled, GIL released)."""
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def warmup():
+    """Compile (or load from cache) every kernel before anything is timed."""
+    cpu_intensive_task(2)
+    cpu_bound_sync(2)
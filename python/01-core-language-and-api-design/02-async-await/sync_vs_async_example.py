@@ -62,20 +62,27 @@ async def async_approach(urls: List[str]) -> None:
     
     start_time = time.time()
     
-    async with aiohttp.ClientSession() as session:
-        # Create tasks for all URLs concurrently
-        tasks = [async_fetch_url(session, url) for url in urls]
-        
-        # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks)
+    # Cap open sockets and cache DNS lookups so every request to the same host
+    # reuses one resolution and a pool of keep-alive connections
+    connector = aiohttp.TCPConnector(
+        limit=100, limit_per_host=32, use_dns_cache=True, ttl_dns_cache=300
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Create tasks for all URLs concurrently; the TaskGroup waits for all
+        # of them and cancels the rest promptly if one fails
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(async_fetch_url(session, url)) for url in urls]
+            
+            # Print each result as soon as it arrives instead of holding them all
+            processed = 0
+            for next_done in asyncio.as_completed(tasks):
+                print(await next_done)
+                processed += 1
     
     end_time = time.time()
     
-    for result in results:
-        print(result)
-    
     print(f"\nTotal time: {end_time - start_time:.2f} seconds")
-    print(f"Processed {len(results)} URLs")
+    print(f"Processed {processed} URLs")
 
 
 def cpu_bound_sync(n: int) -> int:
@@ -87,14 +94,14 @@ def cpu_bound_sync(n: int) -> int:
 
 
 async def cpu_bound_async(n: int) -> int:
-    """CPU-bound task wrapped in async (doesn't provide real benefits)."""
-    total = 0
-    for i in range(n):
-        total += i * i
-        # Adding occasional yields to demonstrate that this doesn't help CPU-bound tasks
-        if i % 100000 == 0:
-            await asyncio.sleep(0)
-    return total
+    """CPU-bound task offloaded from the event loop (still no speedup).
+    
+    Sprinkling `await asyncio.sleep(0)` inside the loop only adds event-loop
+    round trips. The idiomatic pattern is to hand the work to an executor so
+    the loop stays responsive - it still runs no faster than the sync version.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, cpu_bound_sync, n)
 
 
 def demonstrate_cpu_bound():
@@ -121,7 +128,8 @@ def demonstrate_cpu_bound():
     asyncio.run(run_async_cpu())
     
     print("\nKey Insight: Async/await doesn't improve CPU-bound task performance!")
-    print("   Use multiprocessing for CPU-bound parallelism instead.")
+    print("   Offload it with run_in_executor to keep the event loop responsive,")
+    print("   and use multiprocessing for CPU-bound parallelism.")
 
 
 async def demonstrate_async_benefits():
@@ -6,6 +6,10 @@ Demonstrates all-or-nothing transaction behavior
 
 import sqlite3
 
+# Parameter-stable statements: SQLite's per-connection cache compiles each once
+DEBIT_SQL = "UPDATE accounts SET balance = balance - ? WHERE id = ?"
+CREDIT_SQL = "UPDATE accounts SET balance = balance + ? WHERE id = ?"
+
 def setup_and_print_initial_state(conn):
     """Setup initial database and print balances."""
     cursor = conn.cursor()
@@ -22,30 +26,46 @@ def atomic_transfer(conn, from_acc, to_acc, amount, simulate_error=False):
     If error occurs, all changes will be rolled back.
     """
     print(f"\n--- Starting transaction (transfer {amount} from {from_acc} to {to_acc}) ---")
-    cursor = conn.cursor()
     try:
-        # Step 1: Deduct money from source account
-        cursor.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", (amount, from_acc))
-        print(f"  (1) Deducted {amount} from account {from_acc}.")
+        # The connection context manager commits if the block succeeds
+        # and rolls back all changes if any exception escapes it
+        with conn:
+            # Step 1: Deduct money from source account
+            conn.execute(DEBIT_SQL, (amount, from_acc))
+            print(f"  (1) Deducted {amount} from account {from_acc}.")
 
-        # Simulate a system error occurring mid-transaction
-        if simulate_error:
-            raise ValueError("Sudden system error!")
+            # Simulate a system error occurring mid-transaction
+            if simulate_error:
+                raise ValueError("Sudden system error!")
 
-        # Step 2: Add money to destination account
-        cursor.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (amount, to_acc))
-        print(f"  (2) Added {amount} to account {to_acc}.")
+            # Step 2: Add money to destination account
+            conn.execute(CREDIT_SQL, (amount, to_acc))
+            print(f"  (2) Added {amount} to account {to_acc}.")
 
-        # If all steps succeed, commit to save changes
-        conn.commit()
         print("=> Transaction SUCCESSFUL. Changes have been saved.")
 
     except Exception as e:
-        # If any error occurs, rollback all changes
-        conn.rollback()
         print(f"  (!) Error occurred: {e}")
         print("=> Transaction FAILED. Rolled back to initial state.")
 
+def bulk_transfer(conn, transfers):
+    """
+    Apply many transfers in one atomic transaction.
+    Every debit and credit reuses a single prepared UPDATE via executemany.
+    """
+    print(f"\n--- Starting bulk transaction ({len(transfers)} transfers) ---")
+    balance_changes = []
+    for from_acc, to_acc, amount in transfers:
+        balance_changes.append((-amount, from_acc))
+        balance_changes.append((amount, to_acc))
+    try:
+        with conn:
+            conn.executemany(CREDIT_SQL, balance_changes)
+        print("=> Bulk transaction SUCCESSFUL. Changes have been saved.")
+    except sqlite3.Error as e:
+        print(f"  (!) Error occurred: {e}")
+        print("=> Bulk transaction FAILED. Rolled back to initial state.")
+
 def main():
     """Main execution scenario"""
     conn = sqlite3.connect(":memory:")
@@ -69,6 +89,14 @@ def main():
     for row in cursor.execute("SELECT id, balance FROM accounts"):
         print(f"  Account {row[0]}: {row[1]}")
 
+    # 3. Bulk scenario: several transfers committed together
+    bulk_transfer(conn, [('A', 'B', 50), ('B', 'A', 20), ('A', 'B', 10)])
+
+    # Print balances after bulk transaction
+    print("\n--- State after bulk transaction ---")
+    for row in cursor.execute("SELECT id, balance FROM accounts"):
+        print(f"  Account {row[0]}: {row[1]}")
+
     conn.close()
 
 if __name__ == "__main__":
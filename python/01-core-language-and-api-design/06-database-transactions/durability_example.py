@@ -9,6 +9,18 @@ import os
 import random
 import tempfile
 
+def connect(db_file):
+    """
+    Open a connection using the WAL journal with synchronous=NORMAL.
+    A commit is appended to the write-ahead log, so it survives an application
+    or process crash with far fewer fsyncs than the default rollback journal.
+    (Only synchronous=FULL also guarantees the last commits survive power loss.)
+    """
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
 def main():
     """Main execution scenario"""
     # Create a temporary database file
@@ -17,7 +29,7 @@ def main():
 
     try:
         # --- 1. Set up initial database ---
-        conn = sqlite3.connect(db_file)
+        conn = connect(db_file)
         cursor = conn.cursor()
         # Create products and orders tables
         cursor.execute("CREATE TABLE products (id TEXT PRIMARY KEY, name TEXT, stock_quantity INT)")
@@ -33,7 +45,7 @@ def main():
         new_order_id = random.randint(1000, 9999)
 
         try:
-            conn_order = sqlite3.connect(db_file)
+            conn_order = connect(db_file)
             cursor_order = conn_order.cursor()
 
             # Step a: Decrease product stock
@@ -43,7 +55,7 @@ def main():
             cursor_order.execute("INSERT INTO orders VALUES (?, 'LP123', 1)", (new_order_id,))
 
             # Step c: COMMIT! This is where Durability comes into play
-            # Data is permanently written to the database file
+            # Data is permanently written to the write-ahead log
             conn_order.commit()
 
             print(f"=> Order placed successfully! Order ID: {new_order_id}. Data has been COMMITTED.")
@@ -52,12 +64,12 @@ def main():
             conn_order.close()
 
         # --- 3. SIMULATE A CRASH ---
-        print("\n... (Suppose the server loses power immediately and restarts) ...\n")
+        print("\n... (Suppose the server process crashes immediately and restarts) ...\n")
 
         # --- 4. Check data after "system recovery" ---
         print("--- System recovers, reconnecting to the database to check ---")
         try:
-            conn_after_crash = sqlite3.connect(db_file)
+            conn_after_crash = connect(db_file)
             cursor_after_crash = conn_after_crash.cursor()
 
             # Check remaining stock
@@ -78,9 +90,10 @@ def main():
             conn_after_crash.close()
 
     finally:
-        # Clean up temporary file
-        if os.path.exists(db_file):
-            os.remove(db_file)
+        # Clean up temporary files (database plus WAL side files)
+        for path in (db_file, db_file + "-wal", db_file + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
 if __name__ == "__main__":
     main()
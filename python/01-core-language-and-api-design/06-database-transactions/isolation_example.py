@@ -4,10 +4,66 @@ ACID - Isolation Example
 Demonstrates concurrent transaction isolation
 """
 
+import contextlib
+import queue
 import sqlite3
 import os
 import tempfile
 
+def connect(db_file):
+    """
+    Open a connection tuned for concurrent access.
+    WAL lets readers keep their snapshot while a writer commits, and
+    isolation_level=None means transactions are started explicitly with BEGIN.
+    """
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    return conn
+
+class SqlitePool:
+    """
+    A fixed set of pre-opened connections: one writer plus `readers`
+    read-only connections. Borrowing one avoids paying connect/PRAGMA
+    setup again every time a transaction needs a connection.
+    """
+
+    def __init__(self, db_file, readers=4):
+        self._writers = queue.Queue(maxsize=1)
+        self._writers.put(connect(db_file))
+        self._readers = queue.Queue(maxsize=readers)
+        for _ in range(readers):
+            conn = connect(db_file)
+            conn.execute("PRAGMA query_only=1")
+            self._readers.put(conn)
+
+    @contextlib.contextmanager
+    def read(self):
+        """Borrow a read-only connection."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextlib.contextmanager
+    def write(self):
+        """Borrow the single write connection."""
+        conn = self._writers.get()
+        try:
+            yield conn
+        finally:
+            self._writers.put(conn)
+
+    def close(self):
+        """Close every pooled connection."""
+        for pooled in (self._readers, self._writers):
+            while not pooled.empty():
+                pooled.get_nowait().close()
+
 def main():
     """Main execution scenario"""
     # --- Setup the database ---
@@ -16,69 +72,75 @@ def main():
     os.close(db_fd)  # Close the file descriptor, we only need the filename
     
     try:
-        conn_setup = sqlite3.connect(db_file)
-        cursor = conn_setup.cursor()
-        cursor.execute("DROP TABLE IF EXISTS accounts")
-        cursor.execute("CREATE TABLE accounts (id TEXT PRIMARY KEY, balance REAL)")
-        cursor.execute("INSERT INTO accounts (id, balance) VALUES ('A', 1000)")
-        conn_setup.commit()
-        conn_setup.close()
+        # Connections are opened and configured once, then borrowed as needed
+        pool = SqlitePool(db_file, readers=1)
 
-        # --- Simulate two concurrent transactions ---
+        try:
+            with pool.write() as conn_setup:
+                # One script, one transaction: a single parse pass and a single commit
+                conn_setup.executescript("""
+                    BEGIN;
+                    DROP TABLE IF EXISTS accounts;
+                    CREATE TABLE accounts (id TEXT PRIMARY KEY, balance REAL);
+                    INSERT INTO accounts (id, balance) VALUES ('A', 1000);
+                    COMMIT;
+                """)
 
-        # Open two separate connections, representing two users/processes
-        conn1 = sqlite3.connect(db_file, isolation_level='SERIALIZABLE') # TX1
-        conn2 = sqlite3.connect(db_file) # TX2
+            # --- Simulate two concurrent transactions ---
 
-        try:
-            cursor1 = conn1.cursor()
-            cursor2 = conn2.cursor()
-
-            # Step 1 (TX1): Start transaction and read the initial balance
-            # conn1.isolation_level = 'SERIALIZABLE' will start a transaction on SELECT
-            cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
-            balance1_before = cursor1.fetchone()[0]
-            print(f"[TX1] First read: Account A balance is {balance1_before}")
-
-            # Step 2 (TX2): Start another transaction and UPDATE the balance, but DO NOT COMMIT yet
-            print("\n[TX2] Starting update...")
-            cursor2.execute("UPDATE accounts SET balance = balance + 500 WHERE id = 'A'")
-            print("[TX2] Updated balance, but NOT COMMITTED yet.")
-
-            # Step 3 (TX1): Read the balance again from transaction 1
-            # Due to isolation, TX1 should not see TX2's uncommitted change
-            print("\n[TX1] Second read (while TX2 has not committed)...")
-            cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
-            balance1_after = cursor1.fetchone()[0]
-            print(f"[TX1] Second read result: Balance is still {balance1_after}")
-
-            # Step 4 (TX2): Now commit transaction 2
-            conn2.commit()
-            print("\n[TX2] Commit complete.")
-
-            # Step 5 (TX1): Read the balance again after TX2 has committed
-            # TX1's transaction is still running and operates on a "snapshot"
-            # of the data as of when it started.
-            cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
-            balance1_final = cursor1.fetchone()[0]
-            print(f"[TX1] Third read (after TX2 commit): Balance is still {balance1_final} because TX1 is still in the old snapshot.")
-
-            # End transaction 1
-            conn1.commit()
-
-            # Step 6: Start a new transaction to see the final state of the database
-            cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
-            final_balance = cursor1.fetchone()[0]
-            print(f"\n[New transaction] Final balance of account A is {final_balance}")
+            # Borrow two separate connections, representing two users/processes
+            with pool.read() as conn1, pool.write() as conn2: # TX1, TX2
+                cursor1 = conn1.cursor()
+                cursor2 = conn2.cursor()
+
+                # Step 1 (TX1): Start transaction and read the initial balance
+                # In WAL mode the first read pins TX1's snapshot of the database
+                cursor1.execute("BEGIN")
+                cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
+                balance1_before = cursor1.fetchone()[0]
+                print(f"[TX1] First read: Account A balance is {balance1_before}")
+
+                # Step 2 (TX2): Start another transaction and UPDATE the balance, but DO NOT COMMIT yet
+                # BEGIN IMMEDIATE takes the write lock up front instead of failing later with SQLITE_BUSY
+                print("\n[TX2] Starting update...")
+                cursor2.execute("BEGIN IMMEDIATE")
+                cursor2.execute("UPDATE accounts SET balance = balance + 500 WHERE id = 'A'")
+                print("[TX2] Updated balance, but NOT COMMITTED yet.")
+
+                # Step 3 (TX1): Read the balance again from transaction 1
+                # Due to isolation, TX1 should not see TX2's uncommitted change
+                print("\n[TX1] Second read (while TX2 has not committed)...")
+                cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
+                balance1_after = cursor1.fetchone()[0]
+                print(f"[TX1] Second read result: Balance is still {balance1_after}")
+
+                # Step 4 (TX2): Now commit transaction 2
+                cursor2.execute("COMMIT")
+                print("\n[TX2] Commit complete.")
+
+                # Step 5 (TX1): Read the balance again after TX2 has committed
+                # TX1's transaction is still running and operates on a "snapshot"
+                # of the data as of when it started.
+                cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
+                balance1_final = cursor1.fetchone()[0]
+                print(f"[TX1] Third read (after TX2 commit): Balance is still {balance1_final} because TX1 is still in the old snapshot.")
+
+                # End transaction 1
+                cursor1.execute("COMMIT")
+
+                # Step 6: Start a new transaction to see the final state of the database
+                cursor1.execute("SELECT balance FROM accounts WHERE id = 'A'")
+                final_balance = cursor1.fetchone()[0]
+                print(f"\n[New transaction] Final balance of account A is {final_balance}")
 
         finally:
-            conn1.close()
-            conn2.close()
+            pool.close()
     
     finally:
-        # Clean up the temporary file
-        if os.path.exists(db_file):
-            os.remove(db_file)
+        # Clean up the temporary files (database plus WAL side files)
+        for path in (db_file, db_file + "-wal", db_file + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
 if __name__ == "__main__":
     main()
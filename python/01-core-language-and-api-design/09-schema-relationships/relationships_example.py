@@ -5,98 +5,129 @@ Demonstrates 1:1, 1:N, and M:N relationships
 """
 
 import sqlite3
+import sys
+
+# All DDL in one script: parsed in a single pass and committed once
+SCHEMA_SQL = """
+BEGIN;
+
+-- Users table (base for all relationships)
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    username TEXT UNIQUE
+);
+
+-- 1:1 Relationship - User to Profile
+CREATE TABLE profiles (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER UNIQUE,
+    bio TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- 1:N Relationship - User to Posts
+CREATE TABLE posts (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER,
+    title TEXT,
+    content TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- M:N Relationship - Users to Roles
+CREATE TABLE roles (
+    id INTEGER PRIMARY KEY,
+    name TEXT
+);
+
+CREATE TABLE user_roles (
+    user_id INTEGER,
+    role_id INTEGER,
+    PRIMARY KEY (user_id, role_id),
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (role_id) REFERENCES roles(id)
+);
+
+-- SQLite does not index foreign keys automatically. Index the join columns
+-- not already covered: profiles.user_id is UNIQUE and user_roles.user_id is
+-- the leading column of the primary key, so both have indexes already.
+CREATE INDEX idx_posts_user_id ON posts(user_id);
+CREATE INDEX idx_user_roles_role_id ON user_roles(role_id);
+
+COMMIT;
+"""
+
+# Query text lives at module level so repeated calls hand sqlite3 the same
+# SQL string and hit its per-connection prepared-statement cache
+ONE_TO_ONE_SQL = """
+SELECT u.username, p.bio
+FROM users u
+LEFT JOIN profiles p ON u.id = p.user_id
+"""
+
+# Correlated subqueries aggregate per user through the foreign-key indexes,
+# instead of joining every child row and then grouping it back down
+ONE_TO_MANY_SQL = """
+SELECT u.username,
+       (SELECT COUNT(*) FROM posts p WHERE p.user_id = u.id) as post_count
+FROM users u
+"""
+
+MANY_TO_MANY_SQL = """
+SELECT u.username,
+       (SELECT GROUP_CONCAT(r.name)
+        FROM user_roles ur
+        JOIN roles r ON ur.role_id = r.id
+        WHERE ur.user_id = u.id) as roles
+FROM users u
+"""
 
 def create_schema(conn):
     """Create tables for all relationship types"""
-    cursor = conn.cursor()
-    
-    # Users table (base for all relationships)
-    cursor.execute("""
-        CREATE TABLE users (
-            id INTEGER PRIMARY KEY,
-            username TEXT UNIQUE
-        )
-    """)
-    
-    # 1:1 Relationship - User to Profile
-    cursor.execute("""
-        CREATE TABLE profiles (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER UNIQUE,
-            bio TEXT,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """)
-    
-    # 1:N Relationship - User to Posts
-    cursor.execute("""
-        CREATE TABLE posts (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            title TEXT,
-            content TEXT,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """)
-    
-    # M:N Relationship - Users to Roles
-    cursor.execute("""
-        CREATE TABLE roles (
-            id INTEGER PRIMARY KEY,
-            name TEXT
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE user_roles (
-            user_id INTEGER,
-            role_id INTEGER,
-            PRIMARY KEY (user_id, role_id),
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            FOREIGN KEY (role_id) REFERENCES roles(id)
-        )
-    """)
-    
-    conn.commit()
+    conn.executescript(SCHEMA_SQL)
 
 def insert_sample_data(conn):
     """Insert sample data to demonstrate relationships"""
-    cursor = conn.cursor()
-    
-    # Insert users
-    users = [('alice',), ('bob',), ('charlie',)]
-    cursor.executemany("INSERT INTO users (username) VALUES (?)", users)
-    
-    # Insert profiles (1:1)
-    profiles = [
-        (1, 'Software engineer who loves Python'),
-        (2, 'Designer with 5 years experience')
-    ]
-    cursor.executemany("INSERT INTO profiles (user_id, bio) VALUES (?, ?)", profiles)
-    
-    # Insert posts (1:N)
-    posts = [
-        (1, 'Python Tips', 'Here are some Python tips...'),
-        (1, 'Database Design', 'Good database design is important...'),
-        (2, 'UI/UX Principles', 'Design principles every developer should know...'),
-        (3, 'Getting Started', 'My first post!')
-    ]
-    cursor.executemany("INSERT INTO posts (user_id, title, content) VALUES (?, ?, ?)", posts)
-    
-    # Insert roles
-    roles = [('admin',), ('editor',), ('viewer',)]
-    cursor.executemany("INSERT INTO roles (name) VALUES (?)", roles)
-    
-    # Insert user-role relationships (M:N)
-    user_roles = [
-        (1, 1),  # alice is admin
-        (1, 2),  # alice is also editor
-        (2, 2),  # bob is editor
-        (3, 3)   # charlie is viewer
-    ]
-    cursor.executemany("INSERT INTO user_roles (user_id, role_id) VALUES (?, ?)", user_roles)
-    
-    conn.commit()
+    # One transaction for every insert: committed once, rolled back on any error
+    with conn:
+        cursor = conn.cursor()
+        
+        # Insert users
+        users = [('alice',), ('bob',), ('charlie',)]
+        cursor.executemany("INSERT INTO users (username) VALUES (?)", users)
+        
+        # Insert profiles (1:1)
+        profiles = [
+            (1, 'Software engineer who loves Python'),
+            (2, 'Designer with 5 years experience')
+        ]
+        cursor.executemany("INSERT INTO profiles (user_id, bio) VALUES (?, ?)", profiles)
+        
+        # Insert posts (1:N)
+        posts = [
+            (1, 'Python Tips', 'Here are some Python tips...'),
+            (1, 'Database Design', 'Good database design is important...'),
+            (2, 'UI/UX Principles', 'Design principles every developer should know...'),
+            (3, 'Getting Started', 'My first post!')
+        ]
+        cursor.executemany("INSERT INTO posts (user_id, title, content) VALUES (?, ?, ?)", posts)
+        
+        # Insert roles
+        roles = [('admin',), ('editor',), ('viewer',)]
+        cursor.executemany("INSERT INTO roles (name) VALUES (?)", roles)
+        
+        # Insert user-role relationships (M:N)
+        user_roles = [
+            (1, 1),  # alice is admin
+            (1, 2),  # alice is also editor
+            (2, 2),  # bob is editor
+            (3, 3)   # charlie is viewer
+        ]
+        cursor.executemany("INSERT INTO user_roles (user_id, role_id) VALUES (?, ?)", user_roles)
+
+def _write_lines(lines):
+    """Write all lines with one stdout call instead of one print per row"""
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
 
 def demonstrate_queries(conn):
     """Show different types of queries for each relationship"""
@@ -104,36 +135,18 @@ def demonstrate_queries(conn):
     
     print("=== 1:1 Relationship Query ===")
     print("Users with their profiles:")
-    cursor.execute("""
-        SELECT u.username, p.bio
-        FROM users u
-        LEFT JOIN profiles p ON u.id = p.user_id
-    """)
-    for row in cursor.fetchall():
-        print(f"  {row[0]}: {row[1] or 'No profile'}")
+    cursor.execute(ONE_TO_ONE_SQL)
+    _write_lines(f"  {name}: {bio or 'No profile'}" for name, bio in cursor)
     
     print("\n=== 1:N Relationship Query ===")
     print("Users and their post counts:")
-    cursor.execute("""
-        SELECT u.username, COUNT(p.id) as post_count
-        FROM users u
-        LEFT JOIN posts p ON u.id = p.user_id
-        GROUP BY u.id, u.username
-    """)
-    for row in cursor.fetchall():
-        print(f"  {row[0]}: {row[1]} posts")
+    cursor.execute(ONE_TO_MANY_SQL)
+    _write_lines(f"  {name}: {count} posts" for name, count in cursor)
     
     print("\n=== M:N Relationship Query ===")
     print("Users and their roles:")
-    cursor.execute("""
-        SELECT u.username, GROUP_CONCAT(r.name) as roles
-        FROM users u
-        LEFT JOIN user_roles ur ON u.id = ur.user_id
-        LEFT JOIN roles r ON ur.role_id = r.id
-        GROUP BY u.id, u.username
-    """)
-    for row in cursor.fetchall():
-        print(f"  {row[0]}: {row[1] or 'No roles'}")
+    cursor.execute(MANY_TO_MANY_SQL)
+    _write_lines(f"  {name}: {roles or 'No roles'}" for name, roles in cursor)
 
 def main():
     """Main execution"""
@@ -33,6 +33,13 @@ from tasks import (
     task_with_dependencies
 )
 
+# Connect to Redis (use 'redis' hostname when running in Docker, 'localhost' otherwise).
+# One client, and so one connection pool, shared by the producer, worker and
+# monitor instead of each building its own.
+# Note: RQ stores pickled (binary) job data, so never use decode_responses=True
+REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
+REDIS_CONN = redis.Redis(host=REDIS_HOST, port=6379, db=0)
+
 
 # ============================================================================
 # PRODUCER - Enqueues tasks
@@ -43,85 +50,85 @@ def enqueue_tasks():
     Producer function that enqueues various types of tasks to RQ.
     This simulates a web application creating background jobs.
     """
-    # Connect to Redis (use 'redis' hostname when running in Docker, 'localhost' otherwise)
-    redis_host = os.getenv('REDIS_HOST', 'localhost')
-    redis_conn = redis.Redis(host=redis_host, port=6379, db=0, decode_responses=True)
-    
     # Create queues with different priorities
-    default_queue = Queue('default', connection=redis_conn)
-    high_priority_queue = Queue('high', connection=redis_conn)
-    low_priority_queue = Queue('low', connection=redis_conn)
+    default_queue = Queue('default', connection=REDIS_CONN)
+    high_priority_queue = Queue('high', connection=REDIS_CONN)
+    low_priority_queue = Queue('low', connection=REDIS_CONN)
     
     print("=" * 70)
     print("RQ TASK PRODUCER - Enqueuing Background Tasks")
     print("=" * 70)
     
-    # 1. Enqueue email tasks (high priority)
-    print("\n[1] Enqueueing HIGH PRIORITY email tasks...")
-    email_job1 = high_priority_queue.enqueue(
-        send_email,
-        to_email="user1@example.com",
-        subject="Welcome to our service",
-        body="Thank you for signing up!"
+    # Describe every job up front, grouped by target queue, so each queue
+    # receives its whole batch in one Redis pipeline instead of one
+    # round trip per job
+    email_data = [
+        Queue.prepare_data(send_email, kwargs={
+            "to_email": "user1@example.com",
+            "subject": "Welcome to our service",
+            "body": "Thank you for signing up!"
+        }),
+        Queue.prepare_data(send_email, kwargs={
+            "to_email": "user2@example.com",
+            "subject": "Password Reset",
+            "body": "Click here to reset your password"
+        }),
+    ]
+    image_data = [
+        Queue.prepare_data(process_image, kwargs={
+            "image_path": "photo_001.jpg",
+            "operation": "resize_thumbnail"
+        }),
+        Queue.prepare_data(process_image, kwargs={
+            "image_path": "photo_002.jpg",
+            "operation": "apply_filter"
+        }),
+    ]
+    report_data = Queue.prepare_data(generate_report, kwargs={
+        "report_type": "monthly_sales",
+        "data_source": "database"
+    })
+    retry_data = Queue.prepare_data(
+        unreliable_task,
+        kwargs={"task_id": 101, "failure_rate": 0.7},
+        retry=Retry(max=3, interval=[1, 2, 3])  # Retry up to 3 times with backoff
     )
-    print(f"   ✓ Enqueued email job: {email_job1.id}")
+    workflow_data = [
+        Queue.prepare_data(task_with_dependencies, kwargs={"step": step, "wait_time": 1})
+        for step in ["validate_data", "transform_data", "load_data"]
+    ]
     
-    email_job2 = high_priority_queue.enqueue(
-        send_email,
-        to_email="user2@example.com",
-        subject="Password Reset",
-        body="Click here to reset your password"
-    )
-    print(f"   ✓ Enqueued email job: {email_job2.id}")
+    email_jobs = high_priority_queue.enqueue_many(email_data)
+    default_jobs = default_queue.enqueue_many(image_data + [retry_data] + workflow_data)
+    report_job = low_priority_queue.enqueue_many([report_data])[0]
+    image_jobs = default_jobs[:2]
+    retry_job = default_jobs[2]
+    workflow_jobs = default_jobs[3:]
     
-    # 2. Enqueue image processing tasks (default priority)
-    print("\n[2] Enqueueing DEFAULT PRIORITY image processing tasks...")
-    image_job1 = default_queue.enqueue(
-        process_image,
-        image_path="photo_001.jpg",
-        operation="resize_thumbnail"
-    )
-    print(f"   ✓ Enqueued image job: {image_job1.id}")
+    # 1. Email tasks (high priority)
+    print("\n[1] Enqueued HIGH PRIORITY email tasks...")
+    for job in email_jobs:
+        print(f"   ✓ Enqueued email job: {job.id}")
     
-    image_job2 = default_queue.enqueue(
-        process_image,
-        image_path="photo_002.jpg",
-        operation="apply_filter"
-    )
-    print(f"   ✓ Enqueued image job: {image_job2.id}")
+    # 2. Image processing tasks (default priority)
+    print("\n[2] Enqueued DEFAULT PRIORITY image processing tasks...")
+    for job in image_jobs:
+        print(f"   ✓ Enqueued image job: {job.id}")
     
-    # 3. Enqueue report generation (low priority)
-    print("\n[3] Enqueueing LOW PRIORITY report generation...")
-    report_job = low_priority_queue.enqueue(
-        generate_report,
-        report_type="monthly_sales",
-        data_source="database"
-    )
+    # 3. Report generation (low priority)
+    print("\n[3] Enqueued LOW PRIORITY report generation...")
     print(f"   ✓ Enqueued report job: {report_job.id}")
     
-    # 4. Enqueue tasks with retry logic
-    print("\n[4] Enqueueing UNRELIABLE tasks (with retry)...")
-    retry_job = default_queue.enqueue(
-        unreliable_task,
-        task_id=101,
-        failure_rate=0.7,
-        retry=Retry(max=3, interval=[1, 2, 3])  # Retry up to 3 times with backoff
-    )
+    # 4. Tasks with retry logic
+    print("\n[4] Enqueued UNRELIABLE tasks (with retry)...")
     print(f"   ✓ Enqueued unreliable job with retry: {retry_job.id}")
     
-    # 5. Enqueue a workflow of dependent tasks
-    print("\n[5] Enqueueing WORKFLOW tasks...")
-    workflow_jobs = []
-    for i, step in enumerate(["validate_data", "transform_data", "load_data"]):
-        job = default_queue.enqueue(
-            task_with_dependencies,
-            step=step,
-            wait_time=1
-        )
-        workflow_jobs.append(job)
+    # 5. A workflow of dependent tasks
+    print("\n[5] Enqueued WORKFLOW tasks...")
+    for i, job in enumerate(workflow_jobs):
         print(f"   ✓ Enqueued workflow step {i+1}: {job.id}")
     
-    # 6. Schedule a delayed task
+    # 6. Schedule a delayed task (separate code path: goes to the scheduler)
     print("\n[6] Scheduling DELAYED task (5 seconds from now)...")
     import datetime
     delayed_job = default_queue.enqueue_in(
@@ -139,8 +146,8 @@ def enqueue_tasks():
     
     # Return job IDs for monitoring
     return {
-        'email_jobs': [email_job1.id, email_job2.id],
-        'image_jobs': [image_job1.id, image_job2.id],
+        'email_jobs': [j.id for j in email_jobs],
+        'image_jobs': [j.id for j in image_jobs],
         'report_job': report_job.id,
         'retry_job': retry_job.id,
         'workflow_jobs': [j.id for j in workflow_jobs],
@@ -160,9 +167,6 @@ def start_worker(queue_names=['high', 'default', 'low']):
     In production, you'd run this in a separate process:
     $ rq worker high default low
     """
-    redis_host = os.getenv('REDIS_HOST', 'localhost')
-    redis_conn = redis.Redis(host=redis_host, port=6379, db=0, decode_responses=True)
-    
     print("=" * 70)
     print("RQ WORKER - Starting Background Task Consumer")
     print("=" * 70)
@@ -171,7 +175,7 @@ def start_worker(queue_names=['high', 'default', 'low']):
     print("=" * 70)
     
     # Create worker
-    worker = Worker(queue_names, connection=redis_conn)
+    worker = Worker(queue_names, connection=REDIS_CONN)
     
     # Start processing jobs
     worker.work(with_scheduler=True)  # with_scheduler enables delayed jobs
@@ -186,17 +190,12 @@ def monitor_jobs(job_ids_dict: dict):
     Monitor the status of enqueued jobs.
     This demonstrates how to check job progress in a web application.
     """
-    redis_host = os.getenv('REDIS_HOST', 'localhost')
-    # Note: Don't use decode_responses=True when fetching jobs (RQ expects binary data)
-    redis_conn = redis.Redis(host=redis_host, port=6379, db=0)
-    
     print("\n" + "=" * 70)
     print("JOB MONITORING - Checking Status")
     print("=" * 70)
     
-    # Wait a bit for some jobs to start processing
-    time.sleep(1)
-    
+    # A one-shot snapshot: no need to sleep first, fetch_many below reads
+    # whatever state every job is in right now in a single round trip
     all_job_ids = []
     for category, ids in job_ids_dict.items():
         if isinstance(ids, list):
@@ -204,46 +203,71 @@ def monitor_jobs(job_ids_dict: dict):
         else:
             all_job_ids.append(ids)
     
-    for job_id in all_job_ids:
-        try:
-            job = Job.fetch(job_id, connection=redis_conn)
-            
-            status_emoji = {
-                'queued': '⏳',
-                'started': '🔄',
-                'finished': '✅',
-                'failed': '❌',
-                'deferred': '⏸️',
-                'scheduled': '📅'
-            }
-            
-            emoji = status_emoji.get(job.get_status(), '❓')
-            print(f"\n{emoji} Job ID: {job_id}")
-            print(f"   Function: {job.func_name}")
-            print(f"   Status: {job.get_status()}")
-            print(f"   Enqueued at: {job.enqueued_at}")
-            
-            if job.is_finished:
-                print(f"   Result: {job.result}")
-            elif job.is_failed:
-                print(f"   Error: {job.exc_info}")
-            
-        except Exception as e:
+    status_emoji = {
+        'queued': '⏳',
+        'started': '🔄',
+        'finished': '✅',
+        'failed': '❌',
+        'deferred': '⏸️',
+        'scheduled': '📅'
+    }
+    
+    # One pipelined round trip for every job (missing jobs come back as None)
+    jobs = Job.fetch_many(all_job_ids, connection=REDIS_CONN)
+    
+    for job_id, job in zip(all_job_ids, jobs):
+        if job is None:
             print(f"\n❌ Job ID: {job_id}")
-            print(f"   Error fetching job: {e}")
+            print("   Error fetching job: job not found")
+            continue
+        
+        # fetch_many already loaded the status; don't hit Redis again for it
+        status = job.get_status(refresh=False)
+        emoji = status_emoji.get(status, '❓')
+        print(f"\n{emoji} Job ID: {job_id}")
+        print(f"   Function: {job.func_name}")
+        print(f"   Status: {status}")
+        print(f"   Enqueued at: {job.enqueued_at}")
+        
+        if status == 'finished':
+            print(f"   Result: {job.result}")
+        elif status == 'failed':
+            print(f"   Error: {job.exc_info}")
     
     # Show queue statistics
     print("\n" + "=" * 70)
     print("QUEUE STATISTICS")
     print("=" * 70)
     
-    for queue_name in ['high', 'default', 'low']:
-        queue = Queue(queue_name, connection=redis_conn)
+    queue_names = ['high', 'default', 'low']
+    registries = []
+    for queue_name in queue_names:
+        queue = Queue(queue_name, connection=REDIS_CONN)
+        failed = FailedJobRegistry(queue=queue)
+        finished = FinishedJobRegistry(queue=queue)
+        started = StartedJobRegistry(queue=queue)
+        # Drop expired entries first, as len(registry) would; started goes first
+        # because cleaning it moves abandoned jobs into the failed registry
+        for registry in (started, failed, finished):
+            registry.cleanup()
+        registries.append((queue, failed, finished, started))
+    
+    # Queue length plus three registry sizes per queue, all in one pipeline
+    with REDIS_CONN.pipeline(transaction=False) as pipe:
+        for queue, failed, finished, started in registries:
+            pipe.llen(queue.key)
+            pipe.zcard(failed.key)
+            pipe.zcard(finished.key)
+            pipe.zcard(started.key)
+        counts = pipe.execute()
+    
+    for i, queue_name in enumerate(queue_names):
+        queued, failed, finished, started = counts[i * 4:(i + 1) * 4]
         print(f"\n{queue_name.upper()} Queue:")
-        print(f"   Jobs in queue: {len(queue)}")
-        print(f"   Failed jobs: {len(FailedJobRegistry(queue=queue))}")
-        print(f"   Finished jobs: {len(FinishedJobRegistry(queue=queue))}")
-        print(f"   Started jobs: {len(StartedJobRegistry(queue=queue))}")
+        print(f"   Jobs in queue: {queued}")
+        print(f"   Failed jobs: {failed}")
+        print(f"   Finished jobs: {finished}")
+        print(f"   Started jobs: {started}")
 
 
 # ============================================================================
@@ -252,17 +276,14 @@ def monitor_jobs(job_ids_dict: dict):
 
 def cleanup_redis():
     """Clean up all Redis queues (useful for testing)."""
-    redis_host = os.getenv('REDIS_HOST', 'localhost')
-    redis_conn = redis.Redis(host=redis_host, port=6379, db=0)
-    
     for queue_name in ['high', 'default', 'low']:
-        queue = Queue(queue_name, connection=redis_conn)
+        queue = Queue(queue_name, connection=REDIS_CONN)
         queue.empty()
         print(f"Cleared {queue_name} queue")
     
     # Clear registries
     for queue_name in ['high', 'default', 'low']:
-        queue = Queue(queue_name, connection=redis_conn)
+        queue = Queue(queue_name, connection=REDIS_CONN)
         FailedJobRegistry(queue=queue).cleanup()
         print(f"Cleaned up {queue_name} failed registry")
 
@@ -6,9 +6,17 @@ These tasks need to be in a separate importable module (not __main__)
 so that RQ workers can properly import and execute them.
 """
 
+import os
 import time
 import random
 
+# Set RQ_REAL_CPU=1 (or true/yes) to run real CPU work in process_image instead of sleeping
+REAL_CPU_WORK = os.getenv("RQ_REAL_CPU", "").lower() in {"1", "true", "yes"}
+
+# Module-private generator: avoids the shared module-level random instance
+# (tasks run one at a time per worker process, so no locking is needed)
+_rng = random.Random()
+
 
 def send_email(to_email: str, subject: str, body: str) -> dict:
     """
@@ -38,8 +46,14 @@ def process_image(image_path: str, operation: str) -> dict:
     print(f"[IMAGE] Processing image: {image_path}")
     print(f"[IMAGE] Operation: {operation}")
     
-    # Simulate processing time
-    time.sleep(3)
+    if REAL_CPU_WORK:
+        # Real CPU work: a 2D FFT on a 1024x1024 image instead of sleeping
+        import numpy as np
+        pixels = np.random.rand(1024, 1024).astype(np.float32)
+        np.fft.fft2(pixels)
+    else:
+        # Simulate processing time
+        time.sleep(3)
     
     result_path = f"processed_{image_path}"
     print(f"[IMAGE] Image processed: {result_path}")
@@ -49,7 +63,7 @@ def process_image(image_path: str, operation: str) -> dict:
         "original": image_path,
         "processed": result_path,
         "operation": operation,
-        "size_kb": random.randint(100, 500)
+        "size_kb": _rng.randint(100, 500)
     }
 
 
@@ -69,7 +83,7 @@ def generate_report(report_type: str, data_source: str) -> dict:
         "report_type": report_type,
         "data_source": data_source,
         "status": "completed",
-        "rows_processed": random.randint(1000, 10000),
+        "rows_processed": _rng.randint(1000, 10000),
         "download_url": f"/reports/{report_type}_{int(time.time())}.pdf"
     }
 
@@ -82,7 +96,7 @@ def unreliable_task(task_id: int, failure_rate: float = 0.5) -> str:
     print(f"[UNRELIABLE] Starting task {task_id}")
     time.sleep(1)
     
-    if random.random() < failure_rate:
+    if _rng.random() < failure_rate:
         error_msg = f"Task {task_id} failed randomly (simulated failure)"
         print(f"[UNRELIABLE] ❌ {error_msg}")
         raise Exception(error_msg)
@@ -11,16 +11,41 @@ Prerequisites:
 """
 
 import httpx
+import aiofiles
 import asyncio
+import io
 import json
+import sys
+from collections import Counter
+from contextvars import ContextVar
 from typing import AsyncIterator
 import time
 
+try:
+    # orjson parses bytes directly in C; its JSONDecodeError subclasses json's
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    # libuv-based drop-in for asyncio's event loop, with faster socket I/O
+    from uvloop import run as run_event_loop
+except ImportError:
+    from asyncio import run as run_event_loop
+
+
+# One client shared by every example: connections are pooled and kept alive
+# instead of each call opening its own client and TCP connection
+CLIENT = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+)
 
 # ============================================================================
 # CLIENT FOR FILE STREAMING
 # ============================================================================
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
 async def download_file_streaming():
     """
     Download a large file using streaming to avoid memory issues.
@@ -33,38 +58,95 @@ async def download_file_streaming():
     url = "http://localhost:8000/download/large-file"
     output_file = "downloaded_file.bin"
     
-    async with httpx.AsyncClient() as client:
-        async with client.stream("GET", url) as response:
-            response.raise_for_status()
-            
-            print(f"Status: {response.status_code}")
-            print(f"Content-Type: {response.headers.get('content-type')}")
-            
-            total_bytes = 0
-            start_time = time.time()
-            
-            # Write to file chunk by chunk
-            with open(output_file, "wb") as f:
-                async for chunk in response.aiter_bytes(chunk_size=8192):
-                    f.write(chunk)
-                    total_bytes += len(chunk)
-                    
-                    # Show progress
-                    if total_bytes % (1024 * 1024) == 0:  # Every 1 MB
-                        elapsed = time.time() - start_time
-                        speed = total_bytes / elapsed / 1024 / 1024  # MB/s
-                        print(f"  Downloaded: {total_bytes / 1024 / 1024:.2f} MB ({speed:.2f} MB/s)")
-            
-            elapsed = time.time() - start_time
-            print(f"\n Download complete!")
-            print(f"  Total: {total_bytes / 1024 / 1024:.2f} MB in {elapsed:.2f}s")
-            print(f"  File saved: {output_file}")
+    async with CLIENT.stream("GET", url) as response:
+        response.raise_for_status()
+        
+        print(f"Status: {response.status_code}")
+        print(f"Content-Type: {response.headers.get('content-type')}")
+        
+        total_bytes = 0
+        start_time = time.time()
+        
+        # Write to file chunk by chunk: 1 MiB chunks mean one unbuffered
+        # write() syscall per MiB, written without blocking the event loop
+        async with aiofiles.open(output_file, "wb", buffering=0) as f:
+            async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                await f.write(chunk)
+                total_bytes += len(chunk)
+                
+                # Show progress (once per chunk)
+                elapsed = time.time() - start_time
+                speed = total_bytes / elapsed / 1024 / 1024  # MB/s
+                print(f"  Downloaded: {total_bytes / 1024 / 1024:.2f} MB ({speed:.2f} MB/s)")
+        
+        elapsed = time.time() - start_time
+        print(f"\n Download complete!")
+        print(f"  Total: {total_bytes / 1024 / 1024:.2f} MB in {elapsed:.2f}s")
+        print(f"  File saved: {output_file}")
 
 
 # ============================================================================
 # CLIENT FOR SERVER-SENT EVENTS (SSE)
 # ============================================================================
 
+class SSEParser:
+    """
+    Incremental Server-Sent Events parser.
+    
+    feed() accepts body chunks of any size and returns the events they
+    complete as (event_type, data) tuples. Bytes already searched are not
+    scanned again, and multi-line data fields are joined with newlines as
+    the SSE spec requires.
+    """
+    
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scanned = 0  # Bytes of the buffer already searched for b"\n\n"
+    
+    def feed(self, chunk: bytes) -> list[tuple[bytes, bytes]]:
+        buffer = self._buffer
+        buffer += chunk
+        events = []
+        start = 0
+        # Back up one byte in case the separator straddles two chunks
+        search_from = max(self._scanned - 1, 0)
+        while (end := buffer.find(b"\n\n", search_from)) != -1:
+            event = self._parse_event(bytes(buffer[start:end]))
+            if event is not None:
+                events.append(event)
+            start = search_from = end + 2
+        del buffer[:start]
+        self._scanned = len(buffer)
+        return events
+    
+    @staticmethod
+    def _parse_event(block: bytes) -> tuple[bytes, bytes] | None:
+        event_type = b"message"
+        data_lines = []
+        for line in block.split(b"\n"):
+            if line.startswith(b"data:"):
+                value = line[5:]
+                data_lines.append(value[1:] if value[:1] == b" " else value)
+            elif line.startswith(b"event:"):
+                event_type = line[6:].strip()
+        if not data_lines:
+            return None  # Comment or keep-alive block, no event to dispatch
+        return event_type, b"\n".join(data_lines)
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Yield the raw `data:` payload of each SSE event.
+    Each network chunk is parsed incrementally as it arrives, so events are
+    delivered immediately and nothing is decoded to text line by line.
+    """
+    parser = SSEParser()
+    # No chunk_size: a fixed size would hold events back until it fills up
+    async for chunk in response.aiter_bytes():
+        for _event_type, data in parser.feed(chunk):
+            yield data
+
+
 async def consume_sse_stream(url: str, duration: int = 10):
     """
     Consume Server-Sent Events (SSE) stream.
@@ -74,38 +156,34 @@ async def consume_sse_stream(url: str, duration: int = 10):
     print(f"CONSUMING SSE STREAM: {url}")
     print("=" * 70)
     
-    async with httpx.AsyncClient(timeout=None) as client:
-        async with client.stream("GET", url) as response:
-            print(f"Connected! Status: {response.status_code}\n")
-            
-            start_time = time.time()
-            event_count = 0
+    async with CLIENT.stream("GET", url, timeout=None) as response:
+        print(f"Connected! Status: {response.status_code}\n")
+        
+        start_time = time.time()
+        event_count = 0
+        
+        # Read event by event (SSE format), as raw bytes
+        async for data in iter_sse_data(response):
+            if time.time() - start_time > duration:
+                print(f"\n⏱  Duration limit reached ({duration}s)")
+                break
             
-            # Read line by line (SSE format)
-            async for line in response.aiter_lines():
-                if time.time() - start_time > duration:
-                    print(f"\n⏱  Duration limit reached ({duration}s)")
-                    break
+            try:
+                event = json_loads(data)
+                event_count += 1
                 
-                if line.startswith("data: "):
-                    data = line[6:]  # Remove "data: " prefix
-                    
-                    try:
-                        event = json.loads(data)
-                        event_count += 1
-                        
-                        # Pretty print the event
-                        timestamp = event.get('timestamp', '')[:19]  # Trim milliseconds
-                        print(f"[Event #{event_count}] {timestamp}")
-                        for key, value in event.items():
-                            if key != 'timestamp':
-                                print(f"  {key}: {value}")
-                        print()
-                    
-                    except json.JSONDecodeError:
-                        print(f"[Event #{event_count}] {data}")
+                # Pretty print the event
+                timestamp = event.get('timestamp', '')[:19]  # Trim milliseconds
+                print(f"[Event #{event_count}] {timestamp}")
+                for key, value in event.items():
+                    if key != 'timestamp':
+                        print(f"  {key}: {value}")
+                print()
             
-            print(f" Received {event_count} events")
+            except json.JSONDecodeError:
+                print(f"[Event #{event_count}] {data.decode(errors='replace')}")
+        
+        print(f" Received {event_count} events")
 
 
 async def stock_ticker_client():
@@ -128,6 +206,22 @@ async def live_logs_client():
 # CLIENT FOR DATA EXPORT STREAMING
 # ============================================================================
 
+async def iter_byte_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Yield each line of the body as raw bytes.
+    Unlike aiter_lines(), nothing is decoded to str first - orjson parses
+    the bytes directly.
+    """
+    pending = b""
+    async for chunk in response.aiter_bytes():
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
 async def download_csv_export():
     """
     Download and process CSV export stream.
@@ -139,30 +233,34 @@ async def download_csv_export():
     
     url = "http://localhost:8000/export/users/csv"
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        async with client.stream("GET", url) as response:
-            response.raise_for_status()
-            
-            row_count = 0
-            sample_rows = []
-            
-            # Process line by line as it arrives
-            async for line in response.aiter_lines():
-                row_count += 1
-                
-                # Save first few rows as samples
-                if row_count <= 5:
-                    sample_rows.append(line)
-                
-                # Show progress
-                if row_count % 1000 == 0:
-                    print(f"  Processed {row_count} rows...")
+    async with CLIENT.stream("GET", url, timeout=60.0) as response:
+        response.raise_for_status()
+        
+        # Process line by line as it arrives, as raw bytes: only the
+        # sample rows ever need decoding
+        lines = iter_byte_lines(response)
+        
+        # Save first few rows as samples, then count the rest without
+        # re-checking on every row whether sampling is done
+        sample_rows = []
+        async for line in lines:
+            sample_rows.append(line.decode().rstrip("\r"))
+            if len(sample_rows) == 5:
+                break
+        
+        row_count = len(sample_rows)
+        async for line in lines:
+            row_count += 1
             
-            print(f"\n CSV download complete!")
-            print(f"  Total rows: {row_count}")
-            print(f"\n  Sample rows:")
-            for i, row in enumerate(sample_rows[:3], 1):
-                print(f"    {i}. {row}")
+            # Show progress
+            if row_count % 1000 == 0:
+                print(f"  Processed {row_count} rows...")
+        
+        print(f"\n CSV download complete!")
+        print(f"  Total rows: {row_count}")
+        print(f"\n  Sample rows:")
+        for i, row in enumerate(sample_rows[:3], 1):
+            print(f"    {i}. {row}")
 
 
 async def download_jsonl_export():
@@ -176,36 +274,38 @@ async def download_jsonl_export():
     
     url = "http://localhost:8000/export/data/jsonl"
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        async with client.stream("GET", url) as response:
-            response.raise_for_status()
-            
-            record_count = 0
-            category_counts = {"A": 0, "B": 0, "C": 0}
-            
-            # Process each JSON line as it arrives
-            async for line in response.aiter_lines():
-                try:
-                    record = json.loads(line)
-                    record_count += 1
-                    
-                    # Process record (e.g., count by category)
-                    category = record.get("category")
-                    if category in category_counts:
-                        category_counts[category] += 1
-                    
-                    # Show progress
-                    if record_count % 500 == 0:
-                        print(f"  Processed {record_count} records...")
+    async with CLIENT.stream("GET", url, timeout=60.0) as response:
+        response.raise_for_status()
+        
+        record_count = 0
+        category_counts = Counter()
+        categories = []
+        
+        # Process each JSON line as it arrives
+        async for line in iter_byte_lines(response):
+            try:
+                record = json_loads(line)
+                record_count += 1
                 
-                except json.JSONDecodeError:
-                    continue
+                # Process record (e.g., count by category), tallied in batches
+                categories.append(record.get("category"))
+                
+                # Show progress
+                if record_count % 500 == 0:
+                    category_counts.update(categories)
+                    categories.clear()
+                    print(f"  Processed {record_count} records...")
             
-            print(f"\n JSONL download complete!")
-            print(f"  Total records: {record_count}")
-            print(f"  Category distribution:")
-            for category, count in sorted(category_counts.items()):
-                print(f"    {category}: {count} ({count/record_count*100:.1f}%)")
+            except json.JSONDecodeError:
+                continue
+        
+        category_counts.update(categories)
+        
+        print(f"\n JSONL download complete!")
+        print(f"  Total records: {record_count}")
+        print(f"  Category distribution:")
+        for category, count in sorted(category_counts.items()):
+            print(f"    {category}: {count} ({count/record_count*100:.1f}%)")
 
 
 # ============================================================================
@@ -227,14 +327,20 @@ async def ai_chat_streaming():
     print(f"Prompt: {prompt}\n")
     print("Response: ", end="", flush=True)
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        async with client.stream("GET", url) as response:
-            response.raise_for_status()
-            
-            # Stream and print each token as it arrives
-            async for chunk in response.aiter_text():
-                print(chunk, end="", flush=True)
-    
+    async with CLIENT.stream("GET", url, timeout=30.0) as response:
+        response.raise_for_status()
+        
+        # Write each token as it arrives, but flush at most every 50 ms:
+        # still looks live, without one write() syscall per token
+        write, flush = sys.stdout.write, sys.stdout.flush
+        last_flush = time.monotonic()
+        async for chunk in response.aiter_text():
+            write(chunk)
+            if (now := time.monotonic()) - last_flush >= 0.05:
+                flush()
+                last_flush = now
+        flush()
+
     print("\n\n Response complete!")
 
 
@@ -252,30 +358,28 @@ async def ai_chat_sse():
     
     print(f"Prompt: {prompt}\n")
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        async with client.stream("GET", url) as response:
-            response.raise_for_status()
+    async with CLIENT.stream("GET", url, timeout=30.0) as response:
+        response.raise_for_status()
+        
+        full_response = ""
+        
+        async for payload in iter_sse_data(response):
+            data = json_loads(payload)
+            event_type = data.get("type")
             
-            full_response = ""
+            if event_type == "start":
+                print(f" Started generating response...")
+                print(f"Response: ", end="", flush=True)
             
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data = json.loads(line[6:])
-                    event_type = data.get("type")
-                    
-                    if event_type == "start":
-                        print(f" Started generating response...")
-                        print(f"Response: ", end="", flush=True)
-                    
-                    elif event_type == "token":
-                        content = data.get("content", "")
-                        full_response += content
-                        print(content, end="", flush=True)
-                    
-                    elif event_type == "complete":
-                        print(f"\n\n Generation complete!")
-                        print(f"  Total tokens: {data.get('total_tokens')}")
-                        print(f"  Finish reason: {data.get('finish_reason')}")
+            elif event_type == "token":
+                content = data.get("content", "")
+                full_response += content
+                print(content, end="", flush=True)
+            
+            elif event_type == "complete":
+                print(f"\n\n Generation complete!")
+                print(f"  Total tokens: {data.get('total_tokens')}")
+                print(f"  Finish reason: {data.get('finish_reason')}")
 
 
 # ============================================================================
@@ -293,27 +397,25 @@ async def track_long_running_task():
     
     url = "http://localhost:8000/process/long-task"
     
-    async with httpx.AsyncClient(timeout=None) as client:
-        async with client.stream("GET", url) as response:
-            response.raise_for_status()
+    async with CLIENT.stream("GET", url, timeout=None) as response:
+        response.raise_for_status()
+        
+        async for payload in iter_sse_data(response):
+            progress = json_loads(payload)
+            
+            step = progress['step']
+            total = progress['total_steps']
+            message = progress['message']
+            percent = progress['progress_percent']
             
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    progress = json.loads(line[6:])
-                    
-                    step = progress['step']
-                    total = progress['total_steps']
-                    message = progress['message']
-                    percent = progress['progress_percent']
-                    
-                    # Progress bar
-                    bar_length = 30
-                    filled = int(bar_length * percent / 100)
-                    bar = "" * filled + "" * (bar_length - filled)
-                    
-                    print(f"[{step}/{total}] {bar} {percent}% - {message}")
+            # Progress bar
+            bar_length = 30
+            filled = int(bar_length * percent / 100)
+            bar = "" * filled + "" * (bar_length - filled)
             
-            print("\n Task completed successfully!")
+            print(f"[{step}/{total}] {bar} {percent}% - {message}")
+        
+        print("\n Task completed successfully!")
 
 
 # ============================================================================
@@ -328,59 +430,98 @@ async def compare_buffered_vs_streamed():
     print("COMPARISON: Buffered vs Streamed Responses")
     print("=" * 70)
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        # Test buffered response
-        print("\n[1] Testing BUFFERED response (loads all data in memory)...")
-        start = time.time()
-        
-        response = await client.get("http://localhost:8000/demo/comparison/buffered")
-        data = response.json()
-        
-        buffered_time = time.time() - start
-        buffered_size = len(response.content)
-        
-        print(f"  ⏱  Time: {buffered_time:.3f}s")
-        print(f"   Response size: {buffered_size / 1024:.2f} KB")
-        print(f"   Records: {len(data['records'])}")
-        
-        # Test streamed response
-        print("\n[2] Testing STREAMED response (processes on-the-fly)...")
-        start = time.time()
-        
-        first_byte_time = None
-        chunk_count = 0
-        total_size = 0
-        
-        async with client.stream("GET", "http://localhost:8000/demo/comparison/streamed") as response:
-            async for chunk in response.aiter_bytes():
-                if first_byte_time is None:
-                    first_byte_time = time.time() - start
-                
-                chunk_count += 1
-                total_size += len(chunk)
-        
-        streamed_time = time.time() - start
-        
-        print(f"  ⏱  Total time: {streamed_time:.3f}s")
-        print(f"   Time to first byte: {first_byte_time:.3f}s (starts immediately!)")
-        print(f"   Response size: {total_size / 1024:.2f} KB")
-        print(f"   Chunks received: {chunk_count}")
-        
-        # Comparison
-        print("\n COMPARISON RESULTS:")
-        print(f"  Time to first byte:")
-        print(f"    Buffered: Must wait {buffered_time:.3f}s for complete response")
-        print(f"    Streamed: Only {first_byte_time:.3f}s to start receiving data")
-        print(f"  Memory efficiency:")
-        print(f"    Buffered: Requires {buffered_size / 1024:.2f} KB in memory")
-        print(f"    Streamed: Only needs memory for current chunk (~few KB)")
-        print(f"\n   Winner: Streaming (better UX and memory efficiency!)")
+    # Test buffered response
+    print("\n[1] Testing BUFFERED response (loads all data in memory)...")
+    start = time.time()
+    
+    response = await CLIENT.get("http://localhost:8000/demo/comparison/buffered", timeout=60.0)
+    data = response.json()
+    
+    buffered_time = time.time() - start
+    buffered_size = len(response.content)
+    
+    print(f"  ⏱  Time: {buffered_time:.3f}s")
+    print(f"   Response size: {buffered_size / 1024:.2f} KB")
+    print(f"   Records: {len(data['records'])}")
+    
+    # Test streamed response
+    print("\n[2] Testing STREAMED response (processes on-the-fly)...")
+    start = time.time()
+    
+    first_byte_time = None
+    chunk_count = 0
+    total_size = 0
+    
+    async with CLIENT.stream("GET", "http://localhost:8000/demo/comparison/streamed", timeout=60.0) as response:
+        async for chunk in response.aiter_bytes():
+            if first_byte_time is None:
+                first_byte_time = time.time() - start
+            
+            chunk_count += 1
+            total_size += len(chunk)
+    
+    streamed_time = time.time() - start
+    
+    print(f"  ⏱  Total time: {streamed_time:.3f}s")
+    print(f"   Time to first byte: {first_byte_time:.3f}s (starts immediately!)")
+    print(f"   Response size: {total_size / 1024:.2f} KB")
+    print(f"   Chunks received: {chunk_count}")
+    
+    # Comparison
+    print("\n COMPARISON RESULTS:")
+    print(f"  Time to first byte:")
+    print(f"    Buffered: Must wait {buffered_time:.3f}s for complete response")
+    print(f"    Streamed: Only {first_byte_time:.3f}s to start receiving data")
+    print(f"  Memory efficiency:")
+    print(f"    Buffered: Requires {buffered_size / 1024:.2f} KB in memory")
+    print(f"    Streamed: Only needs memory for current chunk (~few KB)")
+    print(f"\n   Winner: Streaming (better UX and memory efficiency!)")
 
 
 # ============================================================================
 # MAIN MENU
 # ============================================================================
 
+# ============================================================================
+# RUNNING EXAMPLES CONCURRENTLY
+# ============================================================================
+
+# How many examples may stream from the server at once when running "all"
+MAX_CONCURRENT_EXAMPLES = 5
+
+# Output buffer of the example running in the current task (None = print directly)
+_task_output: ContextVar[io.StringIO | None] = ContextVar("_task_output", default=None)
+
+
+class _PerTaskStdout:
+    """sys.stdout stand-in that sends each task's prints to its own buffer."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text: str) -> int:
+        return (_task_output.get() or self._stream).write(text)
+    
+    def flush(self) -> None:
+        if _task_output.get() is None:
+            self._stream.flush()
+
+
+async def _run_buffered(desc: str, func, semaphore: asyncio.Semaphore) -> None:
+    """Run one example, then print its whole output in one block."""
+    buffer = io.StringIO()
+    _task_output.set(buffer)  # Only affects this task's context
+    try:
+        async with semaphore:
+            await func()
+    except Exception as e:
+        print(f"\n Error in example: {e}")
+        print("Make sure the server is running!\n")
+    finally:
+        _task_output.set(None)
+        print(f"\n### {desc} ###{buffer.getvalue()}", flush=True)
+
+
 async def main():
     """Main menu to run different examples."""
     
@@ -416,35 +557,43 @@ Choose an example to run:
     
     choice = input("\nEnter your choice (or press Enter for all): ").strip()
     
-    if not choice or choice == "all":
-        print("\n Running all examples...\n")
-        for key, (_, func) in examples.items():
-            if func and key != "all":
-                try:
-                    await func()
-                    await asyncio.sleep(1)  # Brief pause between examples
-                except Exception as e:
-                    print(f"\n Error in example: {e}")
-                    print("Make sure the server is running!\n")
-    
-    elif choice == "0":
-        print("Goodbye!")
-        return
-    
-    elif choice in examples and examples[choice][1]:
-        try:
-            await examples[choice][1]()
-        except Exception as e:
-            print(f"\n Error: {e}")
-            print("Make sure the server is running!")
-    
-    else:
-        print("Invalid choice!")
+    try:
+        if not choice or choice == "all":
+            print("\n Running all examples concurrently...\n")
+            # The examples only wait on the network, so run them side by side;
+            # each one's output is buffered and printed when it finishes
+            stdout = sys.stdout
+            sys.stdout = _PerTaskStdout(stdout)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_EXAMPLES)
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for key, (desc, func) in examples.items():
+                        if func and key != "all":
+                            tg.create_task(_run_buffered(desc, func, semaphore))
+            finally:
+                sys.stdout = stdout
+        
+        elif choice == "0":
+            print("Goodbye!")
+            return
+        
+        elif choice in examples and examples[choice][1]:
+            try:
+                await examples[choice][1]()
+            except Exception as e:
+                print(f"\n Error: {e}")
+                print("Make sure the server is running!")
+        
+        else:
+            print("Invalid choice!")
+    finally:
+        # Release the pooled connections before the event loop shuts down
+        await CLIENT.aclose()
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         print("\n\n  Interrupted by user")
     except Exception as e: